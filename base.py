@@ -1,9 +1,11 @@
 """Base Class to manage Arlo's Base Stations."""
 
 import logging
-import json
+import orjson
 from device import Device
 
+logger = logging.getLogger(__name__)
+
 
 class Base(Device):
     """
@@ -14,31 +16,36 @@ class Base(Device):
         status_interval (int): Interval of status messages from generator (seconds).
     """
 
-    def __init__(self, arlo_base, status_interval: int):
+    # mqtt_control only submits its handlers to the executor, never waiting on them
+    control_is_fast = True
+
+    def __init__(self, arlo_base, status_interval: int, executor=None):
         """
         Initialize the Base instance.
 
         Args:
             arlo_base (ArloBase): Arlo base station object.
             status_interval (int): Interval of status messages from generator (seconds).
+            executor (Executor, optional): Executor for blocking pyaarlo calls.
         """
-        super().__init__(arlo_base, status_interval)
-        logging.info("Base added: %s", self.name)
-
-    async def on_event(self, attr: str, value):
+        super().__init__(arlo_base, status_interval, executor)
+        self._available_modes = frozenset(self._arlo.available_modes or ())
+        # Both setters hit the Arlo API synchronously (the mode setter posts
+        # from the calling thread), so they always run in the executor.
+        self._control_handlers = {"mode": self.set_mode, "siren": self.set_siren}
+        self.add_event_handler("activeMode", self.on_mode)
+        self.add_event_handler("sirenState", lambda _: self.notify_status())
+        logger.info("Base added: %s", self.name)
+
+    def on_mode(self, mode: str):
         """
-        Distribute events to the correct handler.
+        Handle mode change events.
 
         Args:
-            attr (str): Attribute name.
-            value: Attribute value.
+            mode (str): New mode.
         """
-        match attr:
-            case "activeMode":
-                self.state_event.set()
-                logging.info("%s mode: %s", self.name, value)
-            case _:
-                pass
+        self.notify_status()
+        logger.info("%s mode: %s", self.name, mode)
 
     def get_status(self) -> dict:
         """
@@ -49,22 +56,21 @@ class Base(Device):
         """
         return {"mode": self._arlo.mode, "siren": self._arlo.siren_state}
 
-    async def mqtt_control(self, payload: str):
+    async def mqtt_control(self, payload: bytes):
         """
         Handle incoming MQTT commands.
 
         Args:
-            payload (str): MQTT payload.
+            payload (bytes): MQTT payload (JSON).
         """
-        handlers = {"mode": self.set_mode, "siren": self.set_siren}
-
         try:
-            payload = json.loads(payload)
+            payload = orjson.loads(payload)
             for k, v in payload.items():  # pyright: ignore [reportAttributeAccessIssue]
-                if k in handlers:
-                    self._event_loop.run_in_executor(None, handlers[k], v)
-        except Exception:
-            logging.warning("%s: Invalid data for MQTT control", self.name)
+                handler = self._control_handlers.get(k)
+                if handler:
+                    self._event_loop.run_in_executor(self._executor, handler, v)
+        except (orjson.JSONDecodeError, AttributeError):
+            logger.warning("%s: Invalid data for MQTT control", self.name)
 
     def set_mode(self, mode: str):
         """
@@ -75,11 +81,14 @@ class Base(Device):
         """
         try:
             mode = mode.lower()
-            if mode not in self._arlo.available_modes:
-                raise ValueError
+            if mode not in self._available_modes:
+                # Modes may have been added since startup, refresh once
+                self._available_modes = frozenset(self._arlo.available_modes or ())
+                if mode not in self._available_modes:
+                    raise ValueError
             self._arlo.mode = mode
         except (AttributeError, ValueError):
-            logging.warning("%s: Invalid mode, ignored", self.name)
+            logger.warning("%s: Invalid mode, ignored", self.name)
 
     def set_siren(self, state):
         """
@@ -97,16 +106,6 @@ class Base(Device):
                 try:
                     self._arlo.siren_on(**state)
                 except AttributeError:
-                    logging.warning("%s: Invalid siren arguments", self.name)
+                    logger.warning("%s: Invalid siren arguments", self.name)
             case _:
                 pass
-
-    @property
-    def state_event(self):
-        """
-        Get the state event object.
-
-        Returns:
-            asyncio.Event: The state event object.
-        """
-        return self._state_event
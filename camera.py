@@ -3,20 +3,48 @@
 import subprocess  # nosec B404
 import logging
 import asyncio
-import shlex
+import collections
+import fcntl
 import os
+from functools import partial
 from decouple import config
 from device import Device
 
 DEBUG = config("DEBUG", default=False, cast=bool)
 
-# Initialize logging
-logging.basicConfig(
-    level=logging.DEBUG if DEBUG else logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
 logger = logging.getLogger(__name__)
 
+# ffmpeg diagnostics are written straight to our stderr in debug mode
+FFMPEG_STDERR = None if DEBUG else subprocess.DEVNULL
+
+# Requested buffer size of the proxy pipe (Linux default is 64 KiB)
+PROXY_PIPE_SIZE = 1 << 20
+F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+
+
+def create_proxy_pipe() -> tuple[int, int]:
+    """
+    Create the pipe between the idle/live streams and the proxy stream.
+
+    The buffer is enlarged up to the kernel limit so ffmpeg blocks less often
+    on the video path. Pipes created by Python are already close-on-exec.
+
+    Returns:
+        tuple: (reader, writer) file descriptors.
+    """
+    reader, writer = os.pipe()
+    size = PROXY_PIPE_SIZE
+    try:
+        with open("/proc/sys/fs/pipe-max-size", encoding="utf-8") as max_size:
+            size = min(size, int(max_size.read()))
+    except (OSError, ValueError):
+        pass
+    try:
+        fcntl.fcntl(writer, F_SETPIPE_SZ, size)
+    except OSError:
+        logger.debug("Unable to resize proxy pipe, keeping default size")
+    return reader, writer
+
 
 class Camera(Device):
     """
@@ -24,7 +52,7 @@ class Camera(Device):
 
     Attributes:
         name (str): Internal name of the camera (not necessarily identical to Arlo).
-        ffmpeg_out (str): FFmpeg output string.
+        ffmpeg_out (list[str]): FFmpeg output arguments.
         timeout (int): Motion timeout of live stream (seconds).
         status_interval (int): Interval of status messages from generator (seconds).
         stream (asyncio.subprocess.Process): Current FFmpeg stream (idle or active).
@@ -32,35 +60,73 @@ class Camera(Device):
 
     # pylint: disable=too-many-instance-attributes
     # pylint: disable=too-many-public-methods
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
 
     # Possible states
     STATES = ["idle", "streaming"]
 
+    # FFmpeg commands feeding the proxy stream
+    # fmt: off
+    IDLE_ARGV = (
+        "ffmpeg", "-re", "-stream_loop", "-1",
+        "-i", "idle.mp4",
+        "-c:v", "copy",
+        "-c:a", "libmp3lame", "-ar", "44100", "-b:a", "8k",
+        "-bsf", "dump_extra", "-f", "mpegts", "pipe:",
+    )
+    LIVE_ARGV_PREFIX = ("ffmpeg", "-i")
+    LIVE_ARGV_SUFFIX = (
+        "-c:v", "copy",
+        "-c:a", "libmp3lame", "-ar", "44100",
+        "-bsf", "dump_extra", "-f", "mpegts", "pipe:",
+    )
+    # fmt: on
+
     def __init__(
-        self, arlo_camera, ffmpeg_out: str, motion_timeout: int, status_interval: int
+        self,
+        arlo_camera,
+        ffmpeg_out: list[str],
+        motion_timeout: int,
+        status_interval: int,
+        executor=None,
     ):
         """
         Initialize the Camera instance.
 
         Args:
             arlo_camera (ArloCamera): Arlo camera object.
-            ffmpeg_out (str): FFmpeg output string.
+            ffmpeg_out (list[str]): FFmpeg output arguments, each one is formatted
+                with the camera name ("{name}", "{{" and "}}" escapes).
             motion_timeout (int): Motion timeout of live stream (seconds).
             status_interval (int): Interval of status messages from generator (seconds).
+            executor (Executor, optional): Executor for blocking pyaarlo calls.
         """
-        super().__init__(arlo_camera, status_interval)
-        self.name = arlo_camera.name.replace(" ", "_").lower()
-        self.ffmpeg_out = shlex.split(ffmpeg_out.format(name=self.name))
+        super().__init__(arlo_camera, status_interval, executor)
+        self.ffmpeg_out = [arg.format(name=self.name) for arg in ffmpeg_out]
         self.timeout = motion_timeout
+        self._timeout_handle = None
         self._timeout_task = None
         self.motion = False
+        self._motion_generation = 0
         self._state = None
         self._motion_event = asyncio.Event()
+        self._available_event = asyncio.Event()
         self.stream = None
+        self._idle_task = None
         self.proxy_stream = None
-        self.proxy_reader, self.proxy_writer = os.pipe()
-        self._pictures = asyncio.Queue()
+        self.proxy_reader, self.proxy_writer = create_proxy_pipe()
+        self._pictures = collections.deque(maxlen=2)
+        self._pictures_ready = asyncio.Event()
         self._listen_pictures = False
+        self._commands = {
+            b"START": partial(self.set_state, "streaming"),
+            b"STOP": partial(self.set_state, "idle"),
+            b"SNAPSHOT": self.request_snapshot,
+        }
+        self.add_event_handler("motionDetected", self.on_motion)
+        self.add_event_handler("activityState", self.on_arlo_state)
+        self.add_event_handler("presignedLastImageData", self.on_picture)
+        self.add_event_handler("batteryLevel", lambda _: self.notify_status())
         logger.info("Camera added: %s", self.name)
 
     async def run(self):
@@ -68,30 +134,37 @@ class Camera(Device):
         Start the camera, wait for it to become available, create event channels,
         and listen for events.
         """
-        while self._arlo.is_unavailable:
-            await asyncio.sleep(5)
+        if self._arlo.is_unavailable:
+            self._arlo.add_attr_callback("connectionState", self.on_connection_state)
+            # The camera may have come back before the callback was registered
+            if not self._arlo.is_unavailable:
+                self._available_event.set()
+            await self._available_event.wait()
         await self.set_state("idle")
         asyncio.create_task(self.start_proxy_stream())
         await super().run()
 
-    async def on_event(self, attr: str, value):
+    def on_connection_state(self, _device, _attr, value):
         """
-        Distribute events to the correct handler.
+        Pyaarlo callback (from its own thread) used while waiting for availability.
 
         Args:
-            attr (str): Attribute name.
-            value: Attribute value.
-        """
-        match attr:
-            case "motionDetected":
-                await self.on_motion(value)
-            case "activityState":
-                await self.on_arlo_state(value)
-            case "presignedLastImageData":
-                if self._listen_pictures:
-                    self.put_picture(value)
-            case _:
-                pass
+            _device (ArloCamera): Arlo camera object.
+            _attr (str): Attribute name.
+            value (str): Connection state of the camera.
+        """
+        if value != "unavailable":
+            self._event_loop.call_soon_threadsafe(self._available_event.set)
+
+    def on_picture(self, pic):
+        """
+        Handle new snapshot events, only buffered when pictures are consumed.
+
+        Args:
+            pic: Picture data.
+        """
+        if self._listen_pictures:
+            self.put_picture(pic)
 
     async def on_motion(self, motion: bool):
         """
@@ -100,16 +173,19 @@ class Camera(Device):
         Args:
             motion (bool): Motion detected status.
         """
-        self.motion = motion
-        self.motion_event.set()
-        logger.info("%s motion: %s", self.name, motion)
+        if motion != self.motion:
+            self.motion = motion
+            self._motion_generation += 1
+            self.motion_event.set()
+            logger.info("%s motion: %s", self.name, motion)
         if motion:
             await self.set_state("streaming")
         else:
-            if self._timeout_task:
-                self._timeout_task.cancel()
-            if not motion:
-                self._timeout_task = asyncio.create_task(self.stream_timeout())
+            if self._timeout_handle:
+                self._timeout_handle.cancel()
+            self._timeout_handle = self._event_loop.call_later(
+                self.timeout, self.stream_timeout
+            )
 
     async def on_arlo_state(self, state: str):
         """
@@ -153,28 +229,51 @@ class Camera(Device):
         Args:
             new_state (str): New state.
         """
-        self.state_event.set()
+        self.notify_status()
         match new_state:
             case "idle":
                 self.stop_stream()
-                asyncio.create_task(self.start_idle_stream())
+                # Only one idle loop may write to the proxy pipe at a time
+                self._cancel_idle_task()
+                self._idle_task = asyncio.create_task(
+                    self.start_idle_stream(), name=f"Idle stream for {self.name}"
+                )
+                self._idle_task.add_done_callback(self._on_task_done)
             case "streaming":
                 await self.start_stream()
 
+    def _cancel_idle_task(self):
+        """Cancel the idle stream loop, including a pending restart."""
+        if self._idle_task and not self._idle_task.done():
+            self._idle_task.cancel()
+
+    def _on_task_done(self, task: asyncio.Task):
+        """
+        Report errors of a background task of the camera.
+
+        Args:
+            task (asyncio.Task): Finished task, named after what it does.
+        """
+        if not task.cancelled() and task.exception():
+            logger.error("%s failed: %s", task.get_name(), task.exception())
+
     async def start_proxy_stream(self):
-        """Start the proxy stream (continuous video stream from FFmpeg)."""
+        """
+        Start the proxy stream (continuous video stream from FFmpeg).
+
+        The proxy keeps the output connection open while the idle and live
+        streams are swapped on its input pipe. Both always write MPEG-TS, so
+        the input format is given explicitly instead of being probed.
+        """
         exit_code = 1
         while exit_code > 0:
             self.proxy_stream = await asyncio.create_subprocess_exec(
-                *(["ffmpeg", "-i", "pipe:"] + self.ffmpeg_out),
+                *(["ffmpeg", "-f", "mpegts", "-i", "pipe:"] + self.ffmpeg_out),
                 stdin=self.proxy_reader,
                 stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE if DEBUG else subprocess.DEVNULL,
+                stderr=FFMPEG_STDERR,
             )
 
-            if DEBUG:
-                asyncio.create_task(self.log_stderr(self.proxy_stream, "proxy_stream"))
-
             exit_code = await self.proxy_stream.wait()
 
             if exit_code > 0:
@@ -189,23 +288,12 @@ class Camera(Device):
         """Start the idle picture stream, writing to the proxy stream."""
         exit_code = 1
         while exit_code > 0:
-            # fmt: off
             self.stream = await asyncio.create_subprocess_exec(
-                *[
-                    "ffmpeg", "-re", "-stream_loop", "-1",
-                    "-i", "idle.mp4",
-                    "-c:v", "copy",
-                    "-c:a", "libmp3lame", "-ar", "44100", "-b:a", "8k",
-                    "-bsf", "dump_extra", "-f", "mpegts", "pipe:",
-                ],
+                *self.IDLE_ARGV,
                 stdin=subprocess.DEVNULL,
                 stdout=self.proxy_writer,
-                stderr=subprocess.PIPE if DEBUG else subprocess.DEVNULL,
+                stderr=FFMPEG_STDERR,
             )
-            # fmt: on
-
-            if DEBUG:
-                asyncio.create_task(self.log_stderr(self.stream, "idle_stream"))
 
             exit_code = await self.stream.wait()
 
@@ -222,31 +310,30 @@ class Camera(Device):
         Request stream, grab it, kill idle stream, and start a new FFmpeg instance
         writing to the proxy stream.
         """
-        stream = await self.event_loop.run_in_executor(None, self._arlo.get_stream)
+        stream = await self._event_loop.run_in_executor(
+            self._executor, self._arlo.get_stream
+        )
         if stream:
+            # An idle loop waiting to restart would write next to the live stream
+            self._cancel_idle_task()
             self.stop_stream()
 
-            # fmt: off
             self.stream = await asyncio.create_subprocess_exec(
-                *[
-                    "ffmpeg", "-i", stream,
-                    "-c:v", "copy",
-                    "-c:a", "libmp3lame", "-ar", "44100",
-                    "-bsf", "dump_extra", "-f", "mpegts", "pipe:",
-                ],
+                *self.LIVE_ARGV_PREFIX,
+                stream,
+                *self.LIVE_ARGV_SUFFIX,
                 stdin=subprocess.DEVNULL,
                 stdout=self.proxy_writer,
-                stderr=subprocess.PIPE if DEBUG else subprocess.DEVNULL,
+                stderr=FFMPEG_STDERR,
             )
-            # fmt: on
-
-            if DEBUG:
-                asyncio.create_task(self.log_stderr(self.stream, "live_stream"))
 
-    async def stream_timeout(self):
-        """Timeout the live stream after the specified duration."""
-        await asyncio.sleep(self.timeout)
-        await self.set_state("idle")
+    def stream_timeout(self):
+        """Timeout the live stream, called once the motion timeout has elapsed."""
+        self._timeout_handle = None
+        self._timeout_task = asyncio.create_task(
+            self.set_state("idle"), name=f"Stream timeout for {self.name}"
+        )
+        self._timeout_task.add_done_callback(self._on_task_done)
 
     def stop_stream(self):
         """Stop the live or idle stream (not the proxy stream)."""
@@ -265,21 +352,20 @@ class Camera(Device):
         """
         self._listen_pictures = True
         while True:
-            data = await self._pictures.get()
-            yield self.name, data
-            self._pictures.task_done()
+            await self._pictures_ready.wait()
+            self._pictures_ready.clear()
+            while self._pictures:
+                yield self.name, self._pictures.popleft()
 
     def put_picture(self, pic):
         """
-        Put a picture into the queue.
+        Put a picture into the buffer, dropping the oldest one when full.
 
         Args:
             pic: Picture data.
         """
-        try:
-            self._pictures.put_nowait(pic)
-        except asyncio.QueueFull:
-            logger.info("picture queue full, ignoring")
+        self._pictures.append(pic)
+        self._pictures_ready.set()
 
     def get_status(self) -> dict:
         """
@@ -297,43 +383,30 @@ class Camera(Device):
         Yields:
             tuple: (name, motion) where name is the camera name and motion is the motion state.
         """
+        generation = self._motion_generation
         while True:
             await self.motion_event.wait()
-            yield self.name, self.motion
             self.motion_event.clear()
+            if generation != self._motion_generation:
+                generation = self._motion_generation
+                yield self.name, self.motion
 
-    async def mqtt_control(self, payload: str):
+    async def mqtt_control(self, payload: bytes):
         """
         Handle incoming MQTT commands.
 
         Args:
-            payload (str): MQTT payload.
-        """
-        match payload.upper():
-            case "START":
-                await self.set_state("streaming")
-            case "STOP":
-                await self.set_state("idle")
-            case "SNAPSHOT":
-                await self.event_loop.run_in_executor(None, self._arlo.request_snapshot)
-
-    async def log_stderr(self, stream, label: str):
+            payload (bytes): MQTT payload.
         """
-        Continuously read from stderr and log the output.
+        command = self._commands.get(payload) or self._commands.get(payload.upper())
+        if command:
+            await command()
 
-        Args:
-            stream: Stream to read from.
-            label (str): Label for logging.
-        """
-        while True:
-            try:
-                line = await stream.stderr.readline()
-                if line:
-                    logger.debug("%s - %s: %s", self.name, label, line.decode().strip())
-                else:
-                    break
-            except ValueError:
-                pass
+    async def request_snapshot(self):
+        """Request a snapshot, delivered later through presignedLastImageData."""
+        await self._event_loop.run_in_executor(
+            self._executor, self._arlo.request_snapshot
+        )
 
     async def shutdown_when_idle(self):
         """Shutdown the camera when it becomes idle."""
@@ -357,16 +430,6 @@ class Camera(Device):
                     # Handle the case when stream is None
                     logger.debug("Stream for %s is not initialized.", self.name)
 
-    @property
-    def state_event(self):
-        """
-        Get the state event object.
-
-        Returns:
-            asyncio.Event: The state event object.
-        """
-        return self._state_event
-
     @property
     def motion_event(self):
         """
@@ -1,6 +1,17 @@
 """Device Class to manage Arlo's Camera devices."""
 
 import asyncio
+import collections
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from topics import (
+    MQTT_TOPIC_CONTROL,
+    MQTT_TOPIC_MOTION,
+    MQTT_TOPIC_PICTURE,
+    MQTT_TOPIC_STATUS,
+)
 
 
 class Device:
@@ -10,70 +21,156 @@ class Device:
     Attributes:
         name (str): Internal name of the device (not necessarily identical to Arlo).
         status_interval (int): Interval of status messages from generator (seconds).
+        topic_picture (str): MQTT topic of snapshots.
+        topic_control (str): MQTT topic of control messages.
+        topic_status (str): MQTT topic of status messages.
+        topic_motion (str): MQTT topic of motion events.
     """
 
-    def __init__(self, arlo_device, status_interval: int):
+    # pylint: disable=too-many-instance-attributes
+
+    # Whether mqtt_control returns without waiting on I/O, so it can be awaited inline
+    control_is_fast = False
+
+    # Pending keepalive timer, shared by all devices
+    _status_timer = None
+
+    def __init__(self, arlo_device, status_interval: int, executor=None):
         """
         Initialize the Device instance.
 
         Args:
             arlo_device (ArloDevice): Arlo device object.
             status_interval (int): Interval of status messages from generator (seconds).
+            executor (Executor, optional): Executor for blocking pyaarlo calls.
+                A single-thread executor is created when omitted.
         """
         self._arlo = arlo_device
         self.name = self._arlo.name.replace(" ", "_").lower()
         self.status_interval = status_interval
-        self._state_event = asyncio.Event()
+        # fmt: off
+        self.topic_picture = MQTT_TOPIC_PICTURE.format(name=self.name)  # pyright: ignore [reportAttributeAccessIssue]
+        self.topic_control = MQTT_TOPIC_CONTROL.format(name=self.name)  # pyright: ignore [reportAttributeAccessIssue]
+        self.topic_status = MQTT_TOPIC_STATUS.format(name=self.name)  # pyright: ignore [reportAttributeAccessIssue]
+        self.topic_motion = MQTT_TOPIC_MOTION.format(name=self.name)  # pyright: ignore [reportAttributeAccessIssue]
+        # fmt: on
+        self._status_queue = asyncio.Queue(maxsize=1)
+        self._keepalive = 0
         self._event_loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"arlo-{self.name}"
+        )
+        self._event_handlers = {}
 
     async def run(self):
         """
         Initialize the device, create event channels, and listen for events.
 
         This method performs the following tasks:
-        - Creates an event channel between pyaarlo callbacks and async generator.
+        - Creates an event channel between pyaarlo callbacks and the event loop.
         - Adds a callback to the Arlo device for all attributes.
-        - Starts periodic status trigger.
         - Listens for and passes events to the handler.
         """
-        event_get, event_put = self.create_sync_async_channel()
+        events, ready, event_put = self.create_sync_async_channel()
         self._arlo.add_attr_callback("*", event_put)
-        asyncio.create_task(self.periodic_status_trigger())
 
-        async for device, attr, value in event_get:
-            if device == self._arlo:
-                asyncio.create_task(self.on_event(attr, value))
+        arlo = self._arlo
+        while True:
+            await ready.wait()
+            ready.clear()
+            while events:
+                device, attr, value = events.popleft()
+                if device is arlo:
+                    asyncio.create_task(self.on_event(attr, value))
+
+    def add_event_handler(self, attr: str, handler):
+        """
+        Register the handler called for changes of a pyaarlo attribute.
+
+        Args:
+            attr (str): Attribute name.
+            handler (callable): Function or coroutine function taking the value.
+        """
+        self._event_handlers[attr] = (handler, inspect.iscoroutinefunction(handler))
 
     async def on_event(self, attr: str, value):
         """
         Distribute events to the correct handler.
 
-        This method should be overridden by subclasses to handle specific events.
+        Subclasses register their handlers with add_event_handler.
 
         Args:
             attr (str): Attribute name.
             value: Attribute value.
         """
-        pass  # pylint: disable=unnecessary-pass
+        entry = self._event_handlers.get(attr)
+        if entry:
+            handler, is_coroutine = entry
+            if is_coroutine:
+                await handler(value)
+            else:
+                handler(value)
 
-    async def periodic_status_trigger(self):
-        """Periodically trigger status updates."""
-        while True:
-            self.state_event.set()
-            await asyncio.sleep(self.status_interval)
+    @staticmethod
+    def periodic_status_trigger(devices: list, interval: int):
+        """
+        Trigger a keepalive status of all devices, then schedule the next one.
+
+        A single timer handle is used for all devices, status changes in between
+        are pushed by the devices themselves.
+
+        Args:
+            devices (list): List of Device objects (cameras and bases).
+            interval (int): Interval of keepalive status messages (seconds).
+        """
+        for device in devices:
+            device.status_keepalive()
+        Device._status_timer = asyncio.get_running_loop().call_later(
+            interval, Device.periodic_status_trigger, devices, interval
+        )
+
+    @staticmethod
+    def stop_status_trigger():
+        """Cancel the pending keepalive timer started by periodic_status_trigger."""
+        if Device._status_timer:
+            Device._status_timer.cancel()
+            Device._status_timer = None
+
+    def status_keepalive(self):
+        """Trigger a status message, even if the status did not change."""
+        self._keepalive += 1
+        self.notify_status()
+
+    def notify_status(self):
+        """
+        Request a status message.
+
+        At most one request is pending, requests made before it is consumed
+        are merged into it as the status is read when it is handled.
+        """
+        try:
+            self._status_queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
 
     async def listen_status(self):
         """
-        Async generator that periodically yields status messages for MQTT.
+        Async generator that yields status messages for MQTT.
+
+        A status is yielded when it changed, or on each keepalive.
 
         Yields:
-            tuple: (name, status) where name is the device name and status is the device status.
+            tuple: (name, status) where name is the device name and status is the
+                JSON encoded device status.
         """
+        last_status = last_keepalive = None
         while True:
-            await self.state_event.wait()
-            status = self.get_status()
-            yield self.name, status
-            self.state_event.clear()
+            await self._status_queue.get()
+            status = self.get_status_bytes()
+            if status != last_status or self._keepalive != last_keepalive:
+                last_status, last_keepalive = status, self._keepalive
+                yield self.name, status
 
     def get_status(self) -> dict:
         """
@@ -86,14 +183,23 @@ class Device:
         """
         return {}
 
-    async def mqtt_control(self, payload: str):
+    def get_status_bytes(self) -> bytes:
+        """
+        Get the device status serialized as JSON, ready to be published.
+
+        Returns:
+            bytes: JSON encoded device status.
+        """
+        return orjson.dumps(self.get_status())
+
+    async def mqtt_control(self, payload: bytes):
         """
         Handle MQTT control messages.
 
         This method should be overridden by subclasses to handle device-specific MQTT controls.
 
         Args:
-            payload (str): MQTT payload.
+            payload (bytes): MQTT payload.
         """
         pass  # pylint: disable=unnecessary-pass
 
@@ -101,31 +207,27 @@ class Device:
         """
         Create a synchronous/asynchronous channel for event communication.
 
+        Events are appended to a deque, the event loop is only woken up when the
+        consumer is not already due to drain it.
+
         Returns:
-            tuple: (get, put) where get is an async generator that yields queued data,
+            tuple: (events, ready, put) where events is the deque of queued data, ready
+                is the asyncio.Event set when data is available (clear it before draining),
                 and put is a function used in synchronous callbacks to put data into the queue.
         """
-        queue = asyncio.Queue()
+        events = collections.deque()
+        ready = asyncio.Event()
 
         def put(*args):
-            self._event_loop.call_soon_threadsafe(queue.put_nowait, args)
-
-        async def get():
-            while True:
-                yield await queue.get()
-                queue.task_done()
-
-        return get(), put
-
-    @property
-    def state_event(self):
-        """
-        Get the state event object.
-
-        Returns:
-            asyncio.Event: The state event object.
-        """
-        return self._state_event
+            events.append(args)
+            if ready.is_set():
+                return
+            if threading.get_ident() == self._loop_thread_id:
+                ready.set()
+            else:
+                self._event_loop.call_soon_threadsafe(ready.set)
+
+        return events, ready, put
 
     @property
     def event_loop(self):
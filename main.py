@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
+import shlex
 import signal
+from concurrent.futures import ThreadPoolExecutor
 import pyaarlo  # pylint: disable=import-error # pyright: ignore [reportMissingImports]
 from decouple import (  # pylint: disable=import-error # pyright: ignore [reportMissingImports]
     config,
@@ -10,6 +12,7 @@ from decouple import (  # pylint: disable=import-error # pyright: ignore [report
 import mqtt
 from camera import Camera
 from base import Base
+from device import Device
 
 
 # Read config from ENV
@@ -27,6 +30,7 @@ PYAARLO_BACKEND = config("PYAARLO_BACKEND", default=None)
 PYAARLO_REFRESH_DEVICES = config("PYAARLO_REFRESH_DEVICES", default=0, cast=int)
 PYAARLO_STREAM_TIMEOUT = config("PYAARLO_STREAM_TIMEOUT", default=0, cast=int)
 PYAARLO_STORAGE_DIR = config("PYAARLO_STORAGE_DIR", default=None)
+ARLO_EXECUTOR_WORKERS = config("ARLO_EXECUTOR_WORKERS", default=0, cast=int)
 
 # Initialize logging
 logging.basicConfig(
@@ -48,6 +52,12 @@ async def main():
     - Handles graceful shutdown.
     """
 
+    # Run new tasks eagerly until their first suspension (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(
+            asyncio.eager_task_factory  # pyright: ignore [reportAttributeAccessIssue]
+        )
+
     # login to arlo with 2FA
     arlo_args = {
         "username": ARLO_USER,
@@ -73,49 +83,62 @@ async def main():
 
     arlo = pyaarlo.PyArlo(**arlo_args)
 
+    # Shared pool for blocking pyaarlo calls, each device has at most one
+    # outstanding call so there is no need for the default pool size
+    executor = ThreadPoolExecutor(
+        max_workers=ARLO_EXECUTOR_WORKERS or max(4, len(arlo.cameras) + 2),
+        thread_name_prefix="arlo-io",
+    )
+
     # Initialize bases
-    bases = [Base(b, STATUS_INTERVAL) for b in arlo.base_stations]
+    bases = [Base(b, STATUS_INTERVAL, executor) for b in arlo.base_stations]
 
     # Initialize cameras
+    ffmpeg_out = shlex.split(FFMPEG_OUT)  # pyright: ignore [reportArgumentType]
     cameras = [
         Camera(
             c,
-            FFMPEG_OUT,  # pyright: ignore [reportArgumentType]
+            ffmpeg_out,
             MOTION_TIMEOUT,
             STATUS_INTERVAL,
+            executor,
         )
         for c in arlo.cameras
     ]
 
-    # Start both
-    # fmt: off
-    tasks = [asyncio.create_task(d.run()) for d in cameras + bases]
-    # fmt: on
-
-    # Initialize mqtt service
-    if MQTT_BROKER != "fake":
-        asyncio.create_task(mqtt.mqtt_client(cameras, bases))
-
     # Graceful shutdown
-    def request_shutdown(sig, frame):
-        logging.info("%s : %s requested...", frame, sig)
+    def request_shutdown(sig):
+        logging.info("%s requested...", sig.name)
         shutdown_event.set()
 
     # Register callbacks for shutdown
-    signal.signal(signal.SIGTERM, request_shutdown)
-    signal.signal(signal.SIGINT, request_shutdown)
-
-    # Wait for all tasks to complete before shutting down
-    await asyncio.gather(*tasks)
-
-    # Wait for shutdown
-    await shutdown_event.wait()
-
-    logging.info("Shutting down...")
-    for c in cameras:
-        c.shutdown()
-
-    arlo.stop(logout=True)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, request_shutdown, sig)
+
+    # One timer triggers the keepalive status of every device
+    Device.periodic_status_trigger(cameras + bases, STATUS_INTERVAL)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            # Start both
+            tasks = [tg.create_task(d.run()) for d in cameras + bases]
+
+            # Initialize mqtt service
+            if MQTT_BROKER != "fake":
+                tasks.append(tg.create_task(mqtt.mqtt_client(cameras, bases)))
+
+            # Wait for shutdown, then cancel every task of the group
+            await shutdown_event.wait()
+            for task in tasks:
+                task.cancel()
+    finally:
+        logging.info("Shutting down...")
+        Device.stop_status_trigger()
+        for c in cameras:
+            c.shutdown()
+
+        arlo.stop(logout=True)
 
 
 # Run main
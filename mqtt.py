@@ -1,33 +1,33 @@
 """MQTT functions for Arlo's Camera devices."""
 
 import base64 as b64
-import json
+import collections
 import logging
 import asyncio
 import time
 import aiomqtt
-from aiostream import stream
+import orjson
 from decouple import config
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
 MQTT_BROKER = config("MQTT_BROKER", cast=str, default="localhost")
 MQTT_PORT = config("MQTT_PORT", cast=int, default=1883)
 MQTT_USER = config("MQTT_USER", cast=str, default="arlo")
 MQTT_PASS = config("MQTT_PASS", cast=str, default="arlo")
 MQTT_RECONNECT_INTERVAL = config("MQTT_RECONNECT_INTERVAL", default=5)
-MQTT_TOPIC_PICTURE = config("MQTT_TOPIC_PICTURE", default="arlo/picture/{name}")
-MQTT_TOPIC_CONTROL = config("MQTT_TOPIC_CONTROL", default="arlo/control/{name}")
-MQTT_TOPIC_STATUS = config("MQTT_TOPIC_STATUS", default="arlo/status/{name}")
-MQTT_TOPIC_MOTION = config("MQTT_TOPIC_MOTION", default="arlo/motion/{name}")
-
-DEBUG = config("DEBUG", default=False, cast=bool)
-
-# Initialize logging
-logging.basicConfig(
-    level=logging.DEBUG if DEBUG else logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+MQTT_CLIENT_ID = config("MQTT_CLIENT_ID", cast=str, default="arlo-streamer")
+MQTT_SESSION_EXPIRY = config("MQTT_SESSION_EXPIRY", cast=int, default=3600)
+
 logger = logging.getLogger(__name__)
 
+# Pictures waiting to be published, per camera
+PICTURE_QUEUE_SIZE = 2
+
+# Keep the session (and its subscriptions) on the broker across reconnects
+CONNECT_PROPERTIES = Properties(PacketTypes.CONNECT)
+CONNECT_PROPERTIES.SessionExpiryInterval = MQTT_SESSION_EXPIRY
+
 
 async def mqtt_client(cameras: list, bases: list):
     """
@@ -44,6 +44,10 @@ async def mqtt_client(cameras: list, bases: list):
                 port=MQTT_PORT,  # pyright: ignore [reportArgumentType]
                 username=MQTT_USER,  # pyright: ignore [reportArgumentType]
                 password=MQTT_PASS,  # pyright: ignore [reportArgumentType]
+                client_id=MQTT_CLIENT_ID,  # pyright: ignore [reportArgumentType]
+                protocol=aiomqtt.ProtocolVersion.V5,
+                clean_start=False,
+                properties=CONNECT_PROPERTIES,
             ) as client:
                 logger.info("MQTT client connected to %s", MQTT_BROKER)
                 await asyncio.gather(
@@ -57,6 +61,114 @@ async def mqtt_client(cameras: list, bases: list):
             await asyncio.sleep(MQTT_RECONNECT_INTERVAL)
 
 
+async def pump(source, queue: asyncio.Queue, topic: str, serialize, maxlen=None):
+    """
+    Forward the messages of a device generator into a shared queue.
+
+    Payloads are buffered per device and the shared queue only holds one
+    (topic, buffer) reference per message, so a bounded buffer drops the oldest
+    message of this device without touching those of the other devices.
+
+    Args:
+        source: Async generator yielding (name, data) tuples.
+        queue (asyncio.Queue): Queue of (topic, buffer) tuples to publish.
+        topic (str): Topic of the device.
+        serialize (callable): Function building the payload from (name, data).
+        maxlen (int, optional): Maximum number of unpublished payloads of the device.
+    """
+    pending = collections.deque(maxlen=maxlen)
+    async for name, data in source:
+        pending.append(serialize(name, data))
+        queue.put_nowait((topic, pending))
+
+
+async def publish_batched(
+    client: aiomqtt.Client,
+    queue: asyncio.Queue,
+    max_batch: int = 32,
+    max_wait: float = 0.02,
+):
+    """
+    Publish queued messages, coalescing those arriving close together.
+
+    Messages received within max_wait seconds of the first one of a batch are
+    published concurrently instead of one after the other. References to a
+    buffer whose payloads were dropped are skipped.
+
+    Args:
+        client (aiomqtt.Client): MQTT client instance.
+        queue (asyncio.Queue): Queue of (topic, buffer) tuples filled by pump.
+        max_batch (int): Maximum number of messages published at once.
+        max_wait (float): Time window used to coalesce messages (seconds).
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = []
+        deadline = None
+        while len(batch) < max_batch:
+            if not queue.empty():
+                topic, pending = queue.get_nowait()
+            elif not batch:
+                topic, pending = await queue.get()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    topic, pending = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if pending:
+                batch.append((topic, pending.popleft()))
+                if deadline is None:
+                    deadline = loop.time() + max_wait
+        await asyncio.gather(
+            *(client.publish(topic, payload=payload, qos=0) for topic, payload in batch)
+        )
+
+
+async def publish_merged(client: aiomqtt.Client, sources: list, serialize, maxlen=None):
+    """
+    Merge device generators into a single queue and publish it to MQTT.
+
+    Args:
+        client (aiomqtt.Client): MQTT client instance.
+        sources (list): (generator, topic) tuples, generators yield (name, data).
+        serialize (callable): Function building the payload from (name, data).
+        maxlen (int, optional): Maximum number of unpublished messages per device.
+    """
+    queue = asyncio.Queue()
+    pumps = [
+        asyncio.create_task(pump(source, queue, topic, serialize, maxlen))
+        for source, topic in sources
+    ]
+    try:
+        await publish_batched(client, queue)
+    finally:
+        for task in pumps:
+            task.cancel()
+
+
+def picture_payload(name: str, data: bytes) -> bytes:
+    """
+    Build the JSON payload of a snapshot message.
+
+    The base64 encoded picture is inserted as is, it only contains characters
+    which need no escaping in a JSON string.
+
+    Args:
+        name (str): Camera name.
+        data (bytes): Picture data.
+
+    Returns:
+        bytes: JSON payload with filename and base64 encoded picture.
+    """
+    return b'{"filename":%s,"payload":"%s"}' % (
+        orjson.dumps(f"{time.time_ns()} {name}.jpg"),
+        b64.b64encode(data),
+    )
+
+
 async def pic_streamer(client: aiomqtt.Client, cameras: list):
     """
     Merge picture streams from all cameras and publish to MQTT.
@@ -65,21 +177,12 @@ async def pic_streamer(client: aiomqtt.Client, cameras: list):
         client (aiomqtt.Client): MQTT client instance.
         cameras (list): List of Camera objects.
     """
-    pics = stream.merge(*[c.get_pictures() for c in cameras])
-    async with pics.stream() as streamer:
-        async for name, data in streamer:
-            timestamp = str(time.time()).replace(".", "")
-            await client.publish(
-                MQTT_TOPIC_PICTURE.format(  # pyright: ignore [reportAttributeAccessIssue]
-                    name=name
-                ),
-                payload=json.dumps(
-                    {
-                        "filename": f"{timestamp} {name}.jpg",
-                        "payload": b64.b64encode(data).decode("utf-8"),
-                    }
-                ),
-            )
+    await publish_merged(
+        client,
+        [(c.get_pictures(), c.topic_picture) for c in cameras],
+        picture_payload,
+        maxlen=PICTURE_QUEUE_SIZE,
+    )
 
 
 async def device_status(client: aiomqtt.Client, devices: list):
@@ -90,15 +193,11 @@ async def device_status(client: aiomqtt.Client, devices: list):
         client (aiomqtt.Client): MQTT client instance.
         devices (list): List of Device objects (cameras and bases).
     """
-    statuses = stream.merge(*[d.listen_status() for d in devices])
-    async with statuses.stream() as streamer:
-        async for name, status in streamer:
-            await client.publish(
-                MQTT_TOPIC_STATUS.format(  # pyright: ignore [reportAttributeAccessIssue]
-                    name=name
-                ),
-                payload=json.dumps(status),
-            )
+    await publish_merged(
+        client,
+        [(d.listen_status(), d.topic_status) for d in devices],
+        lambda _, status: status,
+    )
 
 
 async def motion_stream(client: aiomqtt.Client, cameras: list):
@@ -109,15 +208,11 @@ async def motion_stream(client: aiomqtt.Client, cameras: list):
         client (aiomqtt.Client): MQTT client instance.
         cameras (list): List of Camera objects.
     """
-    motion_states = stream.merge(*[c.listen_motion() for c in cameras])
-    async with motion_states.stream() as streamer:
-        async for name, motion in streamer:
-            await client.publish(
-                MQTT_TOPIC_MOTION.format(  # pyright: ignore [reportAttributeAccessIssue]
-                    name=name
-                ),
-                payload=json.dumps(motion),
-            )
+    await publish_merged(
+        client,
+        [(c.listen_motion(), c.topic_motion) for c in cameras],
+        lambda _, motion: orjson.dumps(motion),
+    )
 
 
 async def mqtt_reader(client: aiomqtt.Client, devices: list):
@@ -128,20 +223,22 @@ async def mqtt_reader(client: aiomqtt.Client, devices: list):
         client (aiomqtt.Client): MQTT client instance.
         devices (list): List of Device objects (cameras and bases).
     """
-    # fmt: off
-    devs = {
-        MQTT_TOPIC_CONTROL.format(name=d.name): d for d in devices  # pyright: ignore [reportAttributeAccessIssue]
-    }
-    # fmt: on
+    devs = {d.topic_control: d for d in devices}
     async with client.messages() as messages:
-        for name, _ in devs.items():
-            await client.subscribe(name)
+        if devs:
+            await client.subscribe([(topic, 0) for topic in devs])
         async for message in messages:
-            if message.topic.value in devs:
-                asyncio.create_task(
-                    devs[message.topic.value].mqtt_control(
-                        message.payload.decode(  # pyright: ignore [reportAttributeAccessIssue,reportOptionalMemberAccess]
-                            "utf-8"
-                        )
-                    )
-                )
+            dev = devs.get(message.topic.value)
+            if dev is None:
+                continue
+            control = dev.mqtt_control(
+                message.payload  # pyright: ignore [reportArgumentType]
+            )
+            if dev.control_is_fast:
+                # Awaited inline, an error must not end the reader
+                try:
+                    await control
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.exception("%s: MQTT control failed", dev.name)
+            else:
+                asyncio.create_task(control)
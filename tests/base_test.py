@@ -1,31 +1,29 @@
 """Test cases for the Base class."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
+import logging
+import threading
+from unittest.mock import PropertyMock
 import pytest
 from base import Base
-from device import Device
+
+
+async def wait_executor(base):
+    """Wait for the calls already submitted to the single-thread executor of base."""
+    await base.event_loop.run_in_executor(base._executor, lambda: None)
 
 
 @pytest.fixture
-def base(mocker):
+async def base(mocker):
     """Fixture for creating a Base instance with a mocked Arlo base."""
     arlo_base = mocker.MagicMock()
+    arlo_base.name = "Test Base"
+    arlo_base.available_modes = ["armed", "disarmed"]
     status_interval = 10
+    return Base(arlo_base, status_interval)
 
-    # Create a new event loop
-    event_loop = asyncio.new_event_loop()
-
-    # Patch the _event_loop attribute on the Device class with the new event loop
-    mocker.patch.object(Device, "_event_loop", new=event_loop)
-
-    base_instance = Base(arlo_base, status_interval)
-
-    return base_instance
 
-
-@pytest.mark.asyncio
-class TestBase(TestDevice):
+class TestBase:
     """Test suite for the Base class."""
 
     @pytest.mark.parametrize(
@@ -37,30 +35,69 @@ class TestBase(TestDevice):
     )
     async def test_on_event(self, base, mocker, attr, value):
         """Test the on_event method."""
-        # Patch the state_event property with a mock object
-        mock_state_event = mocker.patch.object(
-            base, "state_event", new_callable=AsyncMock
-        )
+        # Patch the notify_status method with a mock object
+        mock_notify_status = mocker.patch.object(base, "notify_status")
 
         # Call the on_event method with the provided attr and value
         await base.on_event(attr, value)
 
         # Assertions for the "activeMode" case
         if attr == "activeMode":
-            mock_state_event.set.assert_called_once()
-            assert base._arlo.mode == value
+            mock_notify_status.assert_called_once()
 
         # Assertions for other cases
         else:
-            mock_state_event.set.assert_not_called()
+            mock_notify_status.assert_not_called()
 
     # def test_get_status(self, base):
     #     """Test the get_status method."""
     #     pass
 
-    # async def test_mqtt_control(self, base):
-    #     """Test the mqtt_control method."""
-    #     pass
+    async def test_mqtt_control_mode(self, base):
+        """Test that a mode change is dispatched to the executor."""
+        threads = []
+        mode = PropertyMock(side_effect=lambda _: threads.append(threading.get_ident()))
+        type(base._arlo).mode = mode
+
+        await base.mqtt_control(b'{"mode": "Armed"}')
+        await wait_executor(base)
+
+        mode.assert_called_once_with("armed")
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_mqtt_control_siren(self, base):
+        """Test that siren requests run in the executor, off the event loop."""
+        threads = []
+        base._arlo.siren_on.side_effect = lambda **_: threads.append(
+            threading.get_ident()
+        )
+
+        await base.mqtt_control(b'{"siren": {"duration": 10, "volume": 5}}')
+        await wait_executor(base)
+
+        base._arlo.siren_on.assert_called_once_with(duration=10, volume=5)
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_mqtt_control_is_fast(self, base):
+        """Test that mqtt_control returns while a control is still blocked on I/O."""
+        assert base.control_is_fast
+        release = threading.Event()
+        base._arlo.siren_off.side_effect = release.wait
+
+        await asyncio.wait_for(base.mqtt_control(b'{"siren": "off"}'), 1)
+        assert not release.is_set()
+
+        release.set()
+        await wait_executor(base)
+        base._arlo.siren_off.assert_called_once()
+
+    @pytest.mark.parametrize("payload", [b"not json", b'"armed"', b"[1, 2]"])
+    async def test_mqtt_control_invalid(self, base, caplog, payload):
+        """Test that invalid JSON or a non-object payload is logged and ignored."""
+        with caplog.at_level(logging.WARNING):
+            await base.mqtt_control(payload)
+
+        assert "test_base: Invalid data for MQTT control" in caplog.text
 
     # def test_set_mode(self, base):
     #     """Test the set_mode method."""
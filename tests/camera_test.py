@@ -1,25 +1,91 @@
 """Test cases for the Camera class."""
 
 import asyncio
-from unittest.mock import MagicMock
+import logging
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, mock_open
 import pytest
+import camera as camera_module
 from camera import Camera
 
 
+def make_mock_subproc(side_effect=None):
+    """Create a minimal process stub exposing only terminate()."""
+    return SimpleNamespace(terminate=MagicMock(side_effect=side_effect))
+
+
+@pytest.fixture(autouse=True)
+def mock_subproc(monkeypatch):
+    """Fixture replacing the FFmpeg processes spawned by the cameras with a mock."""
+    process = SimpleNamespace(
+        returncode=None,
+        wait=AsyncMock(return_value=0),
+        kill=MagicMock(),
+        terminate=MagicMock(),
+    )
+    monkeypatch.setattr(
+        "asyncio.create_subprocess_exec", AsyncMock(return_value=process)
+    )
+    return process
+
+
 @pytest.fixture
-def camera():
+async def camera():
     """Fixture for creating a Camera instance with a mocked Arlo camera."""
     arlo_camera = MagicMock()
-    ffmpeg_out = "test_ffmpeg_out"
+    arlo_camera.name = "Test Camera"
+    ffmpeg_out = ["test_ffmpeg_out"]
     motion_timeout = 30
     status_interval = 10
     return Camera(arlo_camera, ffmpeg_out, motion_timeout, status_interval)
 
 
-@pytest.mark.asyncio
+class TestCreateProxyPipe:
+    """Test suite for the create_proxy_pipe function."""
+
+    def test_capped(self, mocker):
+        """Test that the proxy pipe size is capped at the kernel limit."""
+        mocker.patch("builtins.open", mock_open(read_data="65536\n"))
+        set_size = mocker.patch("fcntl.fcntl")
+
+        reader, writer = camera_module.create_proxy_pipe()
+        os.close(reader)
+        os.close(writer)
+
+        set_size.assert_called_once_with(writer, camera_module.F_SETPIPE_SZ, 65536)
+
+    def test_resize_error(self, mocker, caplog):
+        """Test that a failed resize keeps the default pipe size."""
+        mocker.patch("fcntl.fcntl", side_effect=OSError)
+
+        with caplog.at_level(logging.DEBUG):
+            reader, writer = camera_module.create_proxy_pipe()
+        os.write(writer, b"data")
+        assert os.read(reader, 4) == b"data"
+        os.close(reader)
+        os.close(writer)
+
+        assert "Unable to resize proxy pipe" in caplog.text
+
+
 class TestCamera:
     """Test suite for the Camera class."""
 
+    async def test_ffmpeg_out(self, camera):
+        """Test that the output arguments are formatted with the camera name."""
+        camera = Camera(
+            camera._arlo,
+            ["rtmp://127.0.0.1/live/{name}", "drawtext=text='{{name}}'"],
+            camera.timeout,
+            camera.status_interval,
+        )
+
+        assert camera.ffmpeg_out == [
+            "rtmp://127.0.0.1/live/test_camera",
+            "drawtext=text='{name}'",
+        ]
+
     async def test_run(self, camera):
         """Test the run method."""
         pass
@@ -36,42 +102,198 @@ class TestCamera:
         """Test the set_state method."""
         pass
 
-    async def test_start_stream(self, camera):
+    async def test_start_stream(self, camera, mock_subproc):
         """Test the start_stream method."""
-        pass
+        camera._arlo.get_stream = MagicMock(return_value="stream_url")
+        camera.stop_stream = MagicMock()
+
+        await camera.start_stream()
+
+        camera._arlo.get_stream.assert_called_once()
+        camera.stop_stream.assert_called_once()
+        assert camera.stream is mock_subproc
+        assert "stream_url" in asyncio.create_subprocess_exec.call_args.args
+
+    async def test_idle_task_replaced(self, camera):
+        """Test that a new idle stream loop replaces the previous one."""
+        await camera.on_state_change("idle")
+        first = camera._idle_task
+        await camera.on_state_change("idle")
+        await asyncio.sleep(0)
+
+        assert first.cancelled()
+        assert camera._idle_task is not first
+        camera._idle_task.cancel()
+
+    async def test_start_stream_cancels_idle_restart(
+        self, camera, mock_subproc, no_sleep
+    ):
+        """Test that an idle loop waiting to restart does not follow a live stream."""
+        waiting, restart = asyncio.Event(), asyncio.Event()
+
+        async def backoff(*_):
+            waiting.set()
+            await restart.wait()
+
+        no_sleep.side_effect = backoff
+        mock_subproc.wait.return_value = 1
+
+        # The idle stream exits and its loop waits before restarting
+        await camera.on_state_change("idle")
+        await asyncio.wait_for(waiting.wait(), 1)
+        idle_task = camera._idle_task
+        assert asyncio.create_subprocess_exec.call_count == 1
+
+        camera._arlo.get_stream = MagicMock(return_value="stream_url")
+        await camera.start_stream()
+        restart.set()
+        await asyncio.gather(idle_task, return_exceptions=True)
+
+        assert idle_task.cancelled()
+        assert asyncio.create_subprocess_exec.call_count == 2
+        assert "stream_url" in asyncio.create_subprocess_exec.call_args.args
 
     async def test_stream_timeout(self, camera):
-        """Test the stream_timeout method."""
-        pass
+        """Test that the motion timeout is a rearmed timer ending the stream."""
+        camera.set_state = AsyncMock()
+        await camera.on_motion(False)
+        first = camera._timeout_handle
+        await camera.on_motion(False)
+
+        assert first.cancelled()
+        assert camera._timeout_handle.when() == pytest.approx(
+            asyncio.get_running_loop().time() + camera.timeout, abs=1
+        )
+        camera._timeout_handle.cancel()
+
+        camera.stream_timeout()
+        await camera._timeout_task
+        assert camera._timeout_handle is None
+        camera.set_state.assert_awaited_once_with("idle")
+
+    async def test_stream_timeout_error(self, camera, caplog):
+        """Test that an error of the timeout task is logged."""
+        camera.set_state = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with caplog.at_level(logging.ERROR):
+            camera.stream_timeout()
+            await asyncio.gather(camera._timeout_task, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        assert "Stream timeout for test_camera failed: boom" in caplog.text
 
     def test_stop_stream(self, camera):
         """Test the stop_stream method."""
         pass
 
     async def test_get_pictures(self, camera):
-        """Test the get_pictures method."""
-        pass
+        """Test that a waiting consumer is woken up by a new picture."""
+        pictures = camera.get_pictures()
+        pending = asyncio.create_task(anext(pictures))
+        await asyncio.sleep(0)
+        assert not pending.done()
 
-    def test_put_picture(self, camera):
-        """Test the put_picture method."""
-        pass
+        camera.put_picture(b"picture")
+        assert await asyncio.wait_for(pending, 1) == ("test_camera", b"picture")
+
+    async def test_put_picture(self, camera):
+        """Test that the oldest pictures are dropped when the buffer is full."""
+        for pic in (b"pic1", b"pic2", b"pic3"):
+            camera.put_picture(pic)
+
+        pictures = camera.get_pictures()
+        assert await anext(pictures) == ("test_camera", b"pic2")
+        assert await anext(pictures) == ("test_camera", b"pic3")
 
     def test_get_status(self, camera):
         """Test the get_status method."""
         pass
 
     async def test_listen_motion(self, camera):
-        """Test the listen_motion method."""
-        pass
+        """Test that only changes of the motion state are yielded."""
+        camera.set_state = AsyncMock()
+        motion = camera.listen_motion()
+        pending = asyncio.create_task(anext(motion))
+        await asyncio.sleep(0)
+
+        await camera.on_motion(True)
+        assert await asyncio.wait_for(pending, 1) == ("test_camera", True)
+
+        # Repeated state, nothing is yielded
+        await camera.on_motion(True)
+        pending = asyncio.create_task(anext(motion))
+        await asyncio.sleep(0)
+        assert not pending.done()
+
+        await camera.on_motion(False)
+        assert await asyncio.wait_for(pending, 1) == ("test_camera", False)
+        camera._timeout_handle.cancel()
 
-    async def test_mqtt_control(self, camera):
+    @pytest.mark.parametrize(
+        "payload,expected",
+        [
+            (b"START", ("set_state", "streaming")),
+            (b"start", ("set_state", "streaming")),
+            (b"Stop", ("set_state", "idle")),
+            (b"snapshot", ("request_snapshot",)),
+            (b"UNKNOWN", None),
+            (b"", None),
+        ],
+    )
+    async def test_mqtt_control(self, camera, mocker, payload, expected):
         """Test the mqtt_control method."""
-        pass
+        # The command table binds the methods, patch them before it is built
+        set_state = mocker.patch.object(Camera, "set_state", new_callable=AsyncMock)
+        snapshot = mocker.patch.object(
+            Camera, "request_snapshot", new_callable=AsyncMock
+        )
+        camera = Camera(camera._arlo, [], camera.timeout, camera.status_interval)
+
+        await camera.mqtt_control(payload)
+
+        if expected is None:
+            set_state.assert_not_called()
+            snapshot.assert_not_called()
+        elif expected[0] == "set_state":
+            set_state.assert_awaited_once_with(expected[1])
+            snapshot.assert_not_called()
+        else:
+            snapshot.assert_awaited_once_with()
+            set_state.assert_not_called()
 
     async def test_shutdown_when_idle(self, camera):
         """Test the shutdown_when_idle method."""
-        pass
+        camera._state = "streaming"
+        camera.shutdown = MagicMock()
+
+        task = asyncio.create_task(camera.shutdown_when_idle())
+        await asyncio.sleep(1)
+        camera.shutdown.assert_not_called()
+
+        # The polling loop must see the state change
+        camera._state = "idle"
+        await asyncio.wait_for(task, 1)
+        camera.shutdown.assert_called_once()
 
-    def test_shutdown(self, camera):
+    def test_shutdown(self, camera, caplog):
         """Test the shutdown method."""
-        pass
+        camera.stream = make_mock_subproc()
+        camera.proxy_stream = make_mock_subproc()
+
+        with caplog.at_level(logging.INFO):
+            camera.shutdown()
+
+        camera.stream.terminate.assert_called_once()
+        camera.proxy_stream.terminate.assert_called_once()
+        assert "Shutting down test_camera" in caplog.text
+
+    def test_shutdown_with_exceptions(self, camera, caplog):
+        """Test the shutdown method when the processes are already gone."""
+        camera.stream = make_mock_subproc(side_effect=ProcessLookupError)
+        camera.proxy_stream = make_mock_subproc(side_effect=AttributeError)
+
+        with caplog.at_level(logging.DEBUG):
+            camera.shutdown()
+
+        assert "Process for test_camera already terminated." in caplog.text
+        assert "Stream for test_camera is not initialized." in caplog.text
@@ -0,0 +1,25 @@
+"""Shared fixtures for the test suite."""
+
+import asyncio
+from unittest.mock import AsyncMock
+import pytest
+
+_real_sleep = asyncio.sleep
+
+
+async def _yield_once(*_args, **_kwargs):
+    """Yield to the event loop once instead of sleeping."""
+    await _real_sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """
+    Fixture making asyncio.sleep skip its delay in every test.
+
+    The mock still yields to the event loop, so polling loops under test keep
+    making progress instead of spinning.
+    """
+    sleep = AsyncMock(side_effect=_yield_once)
+    monkeypatch.setattr("asyncio.sleep", sleep)
+    return sleep
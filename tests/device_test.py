@@ -1,51 +1,102 @@
 """Test cases for the Device class."""
 
 import asyncio
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 import pytest
 from device import Device
 
 
 @pytest.fixture
-def device():
+async def device():
     """Fixture for creating a Device instance with a mocked Arlo device."""
     arlo_device = MagicMock()
+    arlo_device.name = "Device"
     status_interval = 10
     return Device(arlo_device, status_interval)
 
 
-@pytest.mark.asyncio
 class TestDevice:
     """Test suite for the Device class."""
 
-    @pytest.mark.asyncio
-    async def test_run(self, device):
+    async def test_run(self, device, mocker):
         """Test the run method."""
+        registered, handled = asyncio.Event(), asyncio.Event()
+        device._arlo.add_attr_callback.side_effect = lambda *_: registered.set()
+        on_event = mocker.patch.object(
+            device,
+            "on_event",
+            new_callable=AsyncMock,
+            side_effect=lambda *_: handled.set(),
+        )
 
-        event_get, event_put = self.create_sync_async_channel()
-        self._arlo.add_attr_callback("*", event_put)
-        asyncio.create_task(self.periodic_status_trigger())
+        task = asyncio.create_task(device.run())
+        await asyncio.wait_for(registered.wait(), 1)
 
-        async for device, attr, value in event_get:
-            if device == self._arlo:
-                asyncio.create_task(self.on_event(attr, value))
+        # Only the events of the device itself are handled
+        event_put = device._arlo.add_attr_callback.call_args.args[1]
+        event_put(MagicMock(), "otherDevice", "value")
+        event_put(device._arlo, "attr", "value")
+        await asyncio.wait_for(handled.wait(), 1)
+        task.cancel()
 
-    async def test_on_event(self, device):
-        """Test the on_event method."""
-        pass
+        on_event.assert_called_once_with("attr", "value")
+
+    async def test_listen_status(self, device):
+        """Test that an unchanged status is only republished on keepalive."""
+        device.get_status = MagicMock(return_value={"state": "idle"})
+        status = device.listen_status()
+
+        device.notify_status()
+        assert await anext(status) == ("device", b'{"state":"idle"}')
+
+        # Unchanged status, nothing is published
+        device.notify_status()
+        pending = asyncio.create_task(anext(status))
+        await asyncio.sleep(0)
+        assert not pending.done()
+
+        # Keepalive tick, the same status is published again
+        device.status_keepalive()
+        assert await asyncio.wait_for(pending, 1) == ("device", b'{"state":"idle"}')
 
     async def test_periodic_status_trigger(self, device):
-        """Test the periodic_status_trigger method."""
-        pass
+        """Test the periodic_status_trigger and stop_status_trigger methods."""
+        device.status_keepalive = MagicMock()
 
-    async def test_listen_status(self, device):
-        """Test the listen_status method."""
-        pass
+        Device.periodic_status_trigger([device], 10)
+        timer = Device._status_timer
+
+        device.status_keepalive.assert_called_once()
+        assert timer is not None and not timer.cancelled()
+
+        Device.stop_status_trigger()
+        assert timer.cancelled()
+        assert Device._status_timer is None
+
+    async def test_notify_status(self, device):
+        """Test that notifications made before the status is read are merged."""
+        device.get_status = MagicMock(return_value={"state": "idle"})
+        status = device.listen_status()
+
+        device.notify_status()
+        device.get_status.return_value = {"state": "streaming"}
+        device.notify_status()
+
+        assert await anext(status) == ("device", b'{"state":"streaming"}')
+        pending = asyncio.create_task(anext(status))
+        await asyncio.sleep(0)
+        assert not pending.done()
+        pending.cancel()
+
+    async def test_create_sync_async_channel(self, device):
+        """Test that events put from another thread are all received in order."""
+        events, ready, put = device.create_sync_async_channel()
+
+        def producer():
+            for i in range(100):
+                put(device._arlo, "attr", i)
 
-    def test_get_status(self, device):
-        """Test the get_status method."""
-        pass
+        await asyncio.to_thread(producer)
+        await asyncio.wait_for(ready.wait(), 1)
 
-    async def test_mqtt_control(self, device):
-        """Test the mqtt_control method."""
-        pass
+        assert [value for _, _, value in events] == list(range(100))
@@ -1,19 +0,0 @@
-"""Test cases for the main script."""
-
-import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-import pytest
-import main
-
-
-@pytest.mark.asyncio
-class TestMain:
-    """Test suite for the main script."""
-
-    async def test_main(self):
-        """Test the main function."""
-        pass
-
-    def test_request_shutdown(self):
-        """Test the request_shutdown function."""
-        pass
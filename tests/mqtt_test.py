@@ -1,31 +1,241 @@
 """Test cases for the MQTT functions."""
 
 import asyncio
+import base64
+import collections
+import logging
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
+import orjson
 import pytest
 import mqtt
 
+STATUS = {"status": "online"}
+
+
+class StopPublishing(Exception):
+    """Raised by the mocked client to end the publishing loop."""
+
+
+def aiter_from(seq):
+    """Async generator yielding the items of seq."""
+
+    async def _gen():
+        for item in seq:
+            yield item
+
+    return _gen()
+
+
+async def aiter_queue(feed):
+    """Async generator yielding the items put into the feed queue."""
+    while True:
+        yield await feed.get()
+
+
+def mock_client():
+    """Create an MQTT client mock which stops after its first publish."""
+    client = MagicMock()
+    client.publish = AsyncMock(side_effect=StopPublishing)
+    return client
+
+
+def mock_reader_client(*messages):
+    """Create an MQTT client mock receiving the given (topic, payload) messages."""
+    client = MagicMock()
+    client.subscribe = AsyncMock()
+    client.messages.return_value.__aenter__.return_value = aiter_from(
+        [
+            SimpleNamespace(topic=SimpleNamespace(value=topic), payload=payload)
+            for topic, payload in messages
+        ]
+    )
+    return client
+
+
+def mock_control_device(topic, control_is_fast):
+    """Create a device mock handling the control messages of topic."""
+    device = MagicMock(
+        topic_control=topic, control_is_fast=control_is_fast, mqtt_control=AsyncMock()
+    )
+    device.name = topic.rsplit("/", 1)[1]
+    return device
+
+
+def assert_published(client, topic, expected):
+    """Assert that the client published the expected JSON payload to topic."""
+    args, kwargs = client.publish.call_args
+    assert args[0] == topic
+    assert orjson.loads(kwargs["payload"]) == expected
+
 
-@pytest.mark.asyncio
 class TestMQTT:
     """Test suite for the MQTT functions."""
 
-    async def test_mqtt_client(self):
+    async def test_mqtt_client(self, mocker):
         """Test the mqtt_client function."""
-        pass
+        client = MagicMock()
+        mocker.patch("aiomqtt.Client").return_value.__aenter__.return_value = client
+        for func in ("mqtt_reader", "device_status", "motion_stream", "pic_streamer"):
+            mocker.patch.object(mqtt, func, new_callable=MagicMock)
+
+        # End the client loop as soon as the services are gathered
+        cancelled = asyncio.get_running_loop().create_future()
+        cancelled.cancel()
+        mocker.patch("asyncio.gather", return_value=cancelled)
+
+        camera, base = MagicMock(), MagicMock()
+        with pytest.raises(asyncio.CancelledError):
+            await mqtt.mqtt_client([camera], [base])
+
+        mqtt.mqtt_reader.assert_called_once_with(client, [camera, base])
+        mqtt.pic_streamer.assert_called_once_with(client, [camera])
 
     async def test_pic_streamer(self):
         """Test the pic_streamer function."""
-        pass
+        client = mock_client()
+        camera = MagicMock(topic_picture="arlo/picture/test")
+        camera.get_pictures.return_value = aiter_from([("test", b"picture")])
+
+        with pytest.raises(StopPublishing):
+            await mqtt.pic_streamer(client, [camera])
+
+        args, kwargs = client.publish.call_args
+        payload = orjson.loads(kwargs["payload"])
+        assert args[0] == "arlo/picture/test"
+        assert payload["filename"].endswith(" test.jpg")
+        assert base64.b64decode(payload["payload"]) == b"picture"
 
     async def test_device_status(self):
         """Test the device_status function."""
-        pass
+        client = mock_client()
+        device = MagicMock(topic_status="arlo/status/test")
+        device.listen_status.return_value = aiter_from([("test", orjson.dumps(STATUS))])
+
+        with pytest.raises(StopPublishing):
+            await mqtt.device_status(client, [device])
+
+        assert_published(client, "arlo/status/test", STATUS)
 
     async def test_motion_stream(self):
         """Test the motion_stream function."""
-        pass
+        client = mock_client()
+        camera = MagicMock(topic_motion="arlo/motion/test")
+        camera.listen_motion.return_value = aiter_from([("test", True)])
+
+        with pytest.raises(StopPublishing):
+            await mqtt.motion_stream(client, [camera])
+
+        assert_published(client, "arlo/motion/test", True)
+
+    async def test_publish_batched(self):
+        """Test that messages queued close together are published as one batch."""
+        queue = asyncio.Queue()
+        await mqtt.pump(
+            aiter_from([("a", b"1"), ("a", b"2"), ("a", b"3")]),
+            queue,
+            "topic/a",
+            lambda _, d: d,
+        )
+        # Arrives while the batch is being collected
+        asyncio.get_running_loop().call_soon(
+            queue.put_nowait, ("topic/b", collections.deque([b"4"]))
+        )
+
+        client = mock_client()
+        with pytest.raises(StopPublishing):
+            await mqtt.publish_batched(client, queue, max_batch=4, max_wait=1)
+
+        # The first gather raised, so every call belongs to one batch
+        assert [c.kwargs["payload"] for c in client.publish.call_args_list] == [
+            b"1",
+            b"2",
+            b"3",
+            b"4",
+        ]
+
+    async def test_publish_batched_max_wait(self):
+        """Test that max_wait ends a partial batch."""
+        queue = asyncio.Queue()
+        queue.put_nowait(("topic/a", collections.deque([b"1"])))
+
+        client = mock_client()
+        with pytest.raises(StopPublishing):
+            await asyncio.wait_for(
+                mqtt.publish_batched(client, queue, max_wait=0.01), 1
+            )
+
+        client.publish.assert_called_once_with("topic/a", payload=b"1", qos=0)
+
+    async def test_pump_drops_per_device(self):
+        """Test that a burst of one device does not drop the messages of another."""
+        queue = asyncio.Queue()
+        feed_a, feed_b = asyncio.Queue(), asyncio.Queue()
+        pumps = [
+            asyncio.create_task(
+                mqtt.pump(aiter_queue(feed), queue, topic, lambda _, d: d, maxlen=2)
+            )
+            for feed, topic in ((feed_a, "topic/a"), (feed_b, "topic/b"))
+        ]
+
+        # The publisher is stalled while b, a burst of a, then b again arrive
+        feed_b.put_nowait(("b", b"b1"))
+        await asyncio.sleep(0)
+        for i in range(5):
+            feed_a.put_nowait(("a", b"a%d" % i))
+        await asyncio.sleep(0)
+        feed_b.put_nowait(("b", b"b2"))
+        await asyncio.sleep(0)
+
+        client = mock_client()
+        with pytest.raises(StopPublishing):
+            await mqtt.publish_batched(client, queue, max_wait=0)
+        for task in pumps:
+            task.cancel()
+
+        published = [
+            (c.args[0], c.kwargs["payload"]) for c in client.publish.call_args_list
+        ]
+        assert published == [
+            ("topic/b", b"b1"),
+            ("topic/a", b"a3"),
+            ("topic/a", b"a4"),
+            ("topic/b", b"b2"),
+        ]
 
     async def test_mqtt_reader(self):
         """Test the mqtt_reader function."""
-        pass
+        fast = mock_control_device("arlo/control/fast", True)
+        slow = mock_control_device("arlo/control/slow", False)
+        client = mock_reader_client(
+            ("arlo/control/unknown", b"START"),
+            ("arlo/control/fast", b'{"mode": "armed"}'),
+            ("arlo/control/slow", b"START"),
+        )
+
+        await mqtt.mqtt_reader(client, [fast, slow])
+
+        client.subscribe.assert_awaited_once_with(
+            [("arlo/control/fast", 0), ("arlo/control/slow", 0)]
+        )
+        fast.mqtt_control.assert_awaited_once_with(b'{"mode": "armed"}')
+        # Slow controls run in their own task
+        slow.mqtt_control.assert_called_once_with(b"START")
+        slow.mqtt_control.assert_not_awaited()
+        await asyncio.sleep(0)
+        slow.mqtt_control.assert_awaited_once()
+
+    async def test_mqtt_reader_control_error(self, caplog):
+        """Test that a failing inline control does not end the reader."""
+        fast = mock_control_device("arlo/control/fast", True)
+        fast.mqtt_control.side_effect = [RuntimeError("executor shut down"), None]
+        client = mock_reader_client(
+            ("arlo/control/fast", b'{"siren": "on"}'),
+            ("arlo/control/fast", b'{"mode": "armed"}'),
+        )
+
+        with caplog.at_level(logging.ERROR):
+            await mqtt.mqtt_reader(client, [fast])
+
+        assert fast.mqtt_control.await_count == 2
+        assert "fast: MQTT control failed" in caplog.text